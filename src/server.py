@@ -1,16 +1,31 @@
 import pandas as pd
+import numpy as np
+import ast
+import datetime
+import hashlib
+import operator
 import time
 import signal
 import sys
 import logging
-from typing import Optional, Dict, Any, Literal
+import json
+import threading
+import weakref
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Literal, Callable
 import os
+from importlib.util import find_spec
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 import mcp.server.stdio
 import argparse
 
+# Copy-on-write lets the mutation tools take shallow copies of the cached
+# DataFrame: only the blocks they actually write to get copied.
+pd.options.mode.copy_on_write = True
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -53,6 +68,25 @@ Available tools and examples:
    Output: Deletes the record at index 1
    ```
 
+4. update_items: Update several records at once
+   Example:
+   ```
+   Input: "update_items", {
+       "items": [
+           {"index": 1, "data": {"name": "Updated Name"}},
+           {"index": 2, "data": {"age": 40}}
+       ]
+   }
+   Output: Updates both records and reports success for each of them
+   ```
+
+5. delete_items: Delete several records at once
+   Example:
+   ```
+   Input: "delete_items", {"indices": [1, 2]}
+   Output: Deletes both records and reports success for each of them
+   ```
+
 Let's work with your file and perform some operations based on your needs.
 
 <mcp>
@@ -60,6 +94,7 @@ Tools:
 - Use query to search and filter data
 - Use update_item to modify existing records
 - Use delete_item to remove records
+- Use update_items and delete_items to change many records in one call
 
 Resources:
 - File content can be accessed and modified
@@ -77,17 +112,78 @@ Please let me know your preferred operation and I'll guide you through the proce
 
 # File setup
 FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "data/example.xls"))
-ALLOWED_FORMATS = Literal["xls", "xlsx", "csv"]
+FILE_EXT = "xls"
+ALLOWED_FORMATS = Literal["xls", "xlsx", "csv", "parquet"]
+
+# Optional faster backends: pyarrow enables the Parquet storage that legacy
+# .xls files are migrated to, python-calamine is a Rust-backed Excel reader.
+HAS_PYARROW = find_spec("pyarrow") is not None
+EXCEL_ENGINE = "calamine" if find_spec("python_calamine") is not None else None
+QUERY_ENGINE = "numexpr" if find_spec("numexpr") is not None else "python"
+HAS_POLARS = find_spec("polars") is not None
 
 def signal_handler(sig, frame):
     """Handle system signals to gracefully shut down the server."""
     print("Shutting down server...")
+    # main() merges the journal once sys.exit unwinds into it; doing it here
+    # could deadlock on a lock held by the interrupted code
     sys.exit(0)
 
 def setup_signal_handling():
     """Setup signal handling for graceful termination."""
     signal.signal(signal.SIGINT, signal_handler)
 
+@lru_cache(maxsize=None)
+def file_extension(file_path: str) -> str:
+    """Return the lower-case extension of a file path, without the dot"""
+    return os.path.splitext(file_path)[1][1:].lower()
+
+def _read_excel(file_path: str) -> pd.DataFrame:
+    """Read the first sheet of a workbook"""
+    return pd.read_excel(file_path, sheet_name=0, engine=EXCEL_ENGINE)
+
+def _has_temporal_columns(df: pd.DataFrame) -> bool:
+    """Check whether any column holds dates, times or timestamps"""
+    for column in df.columns:
+        values = df[column]
+        if values.dtype.kind in "mM":
+            return True
+        if values.dtype == object:
+            first = values.first_valid_index()
+            if first is not None and isinstance(values[first], (datetime.date, datetime.time)):
+                return True
+    return False
+
+def _read_csv(file_path: str) -> pd.DataFrame:
+    """Read a CSV file, with pyarrow's multithreaded parser when available"""
+    if HAS_PYARROW:
+        try:
+            df = pd.read_csv(file_path, engine="pyarrow")
+            # pyarrow parses ISO-like text into dates and timestamps, which
+            # the C parser keeps as text; writing those back would change
+            # how the file spells them
+            if not _has_temporal_columns(df):
+                return df
+        except ValueError as e:
+            # pyarrow rejects files the C parser accepts, e.g. short rows
+            # that the C parser pads with NaN
+            logger.debug(f"Retrying {file_path} with the C parser: {str(e)}")
+    return pd.read_csv(file_path, engine="c", low_memory=False)
+
+# Reader and writer for each supported format. Writers receive an open
+# binary file handle.
+_READERS = {
+    "xls": _read_excel,
+    "xlsx": _read_excel,
+    "csv": _read_csv,
+    "parquet": lambda file_path: pd.read_parquet(file_path, engine="pyarrow"),
+}
+_WRITERS = {
+    "xlsx": lambda df, f: df.to_excel(f, index=False, engine="openpyxl"),
+    "csv": lambda df, f: df.to_csv(f, index=False),
+    "parquet": lambda df, f: df.to_parquet(f, engine="pyarrow", compression="snappy", index=False),
+}
+
 def validate_file(file_path: str) -> Optional[str]:
     """
     Validate file existence and format.
@@ -97,36 +193,515 @@ def validate_file(file_path: str) -> Optional[str]:
         logger.error(f"File not found: {file_path}")
         return None
         
-    file_ext = file_path.split('.')[-1].lower()
-    if file_ext not in ["xls", "xlsx", "csv"]:
+    file_ext = file_extension(file_path)
+    if file_ext not in _READERS:
         logger.error(f"Unsupported file format: {file_ext}")
         return None
         
     return file_ext
 
+# Parsed DataFrames keyed by the (mtime_ns, size) of the file and of its
+# mutation journal, so repeated tool calls skip re-parsing the file until it
+# changes on disk.
+_df_cache: dict[tuple, pd.DataFrame] = {}
+_df_cache_lock = threading.Lock()
+
+def _file_signature(file_path: str) -> Optional[tuple]:
+    """Return (mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _cache_key(file_path: str) -> tuple:
+    """Build the cache key for the current on-disk state of a file"""
+    stat = os.stat(file_path)
+    return (file_path, stat.st_mtime_ns, stat.st_size, _file_signature(journal_path(file_path)))
+
+def _set_cached_df(file_path: str, df: pd.DataFrame, key: Optional[tuple] = None):
+    """Cache a DataFrame for the current state of a file, dropping stale entries"""
+    if key is None:
+        key = _cache_key(file_path)
+    with _df_cache_lock:
+        for stale in [k for k in _df_cache if k[0] == file_path]:
+            del _df_cache[stale]
+        _df_cache[key] = df
+
+def _get_cached_df(file_path: str, key: Optional[tuple] = None) -> Optional[pd.DataFrame]:
+    """Return the cached DataFrame for a file if it is still current"""
+    if key is None:
+        key = _cache_key(file_path)
+    with _df_cache_lock:
+        return _df_cache.get(key)
+
 def read_file(file_path: str) -> pd.DataFrame:
-    """Read the file based on its format"""
-    file_ext = file_path.split('.')[-1].lower()
+    """
+    Read the file based on its format.
+    The parsed DataFrame is cached and shared between calls, so callers
+    must copy it (a shallow copy is enough) before mutating it in place.
+    """
+    key = _cache_key(file_path)
+    cached = _get_cached_df(file_path, key)
+    if cached is not None:
+        return cached
+
+    file_ext = file_extension(file_path)
     try:
-        if file_ext in ["xls", "xlsx"]:
-            return pd.read_excel(file_path)
-        else:  # csv
-            return pd.read_csv(file_path)
+        if file_ext not in _READERS:
+            raise ValueError(f"Unsupported file format: {file_ext}")
+        df = _READERS[file_ext](file_path)
     except Exception as e:
         logger.error(f"Error reading file: {str(e)}")
         raise
 
+    df = replay_journal(file_path, df)
+    if _journal_entries.get(file_path):
+        # Replayed updates that change a column's dtype split it out of its
+        # block; a deep copy consolidates the blocks again so every column
+        # scan runs over one contiguous array per dtype.
+        df = df.copy()
+    _set_cached_df(file_path, df, key)
+    return df
+
+def read_columns(file_path: str) -> list:
+    """Read only the column names, without loading row data where the format allows it"""
+    cached = _get_cached_df(file_path)
+    if cached is not None:
+        return cached.columns.to_list()
+
+    file_ext = file_extension(file_path)
+    if file_ext == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(file_path).schema_arrow.names
+    if file_ext == "csv":
+        return pd.read_csv(file_path, nrows=0).columns.to_list()
+    if file_ext in ["xls", "xlsx"]:
+        return pd.read_excel(file_path, sheet_name=0, nrows=0, engine=EXCEL_ENGINE).columns.to_list()
+    return read_file(file_path).columns.to_list()
+
+# Comparisons that can be pushed down into the Parquet reader. `!=` and
+# `not in` are left to pandas: Arrow drops nulls for them, pandas keeps NaN.
+_PUSHDOWN_OPS = {
+    ast.Eq: "==",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.In: "in",
+}
+
+def _extract_filters(node: ast.AST) -> Optional[list[tuple]]:
+    """Translate `column OP literal` terms joined by `and`/`&` into pyarrow filters"""
+    if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+        terms = [_extract_filters(value) for value in node.values]
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitAnd):
+        terms = [_extract_filters(node.left), _extract_filters(node.right)]
+    elif (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and type(node.ops[0]) in _PUSHDOWN_OPS
+        and isinstance(node.left, ast.Name)
+    ):
+        try:
+            value = ast.literal_eval(node.comparators[0])
+        except (ValueError, TypeError, SyntaxError):
+            return None
+        op = _PUSHDOWN_OPS[type(node.ops[0])]
+        if op == "in":
+            if not isinstance(value, (list, tuple)) or any(v is None for v in value):
+                return None
+            value = list(value)
+        elif value is None or isinstance(value, (list, tuple, dict, set)):
+            return None
+        return [(node.left.id, op, value)]
+    else:
+        return None
+
+    if any(term is None for term in terms):
+        return None
+    return [f for term in terms for f in term]
+
+def _parse_filters(query: str) -> Optional[list[tuple]]:
+    """Return the (column, op, value) filters of a simple query, or None"""
+    try:
+        return _extract_filters(ast.parse(query.strip(), mode="eval").body)
+    except SyntaxError:
+        return None
+
+def read_parquet_filtered(file_path: str, query: str) -> Optional[pd.DataFrame]:
+    """
+    Run a simple query by pushing its predicates into the Parquet reader, so
+    only matching row groups and rows are loaded.
+    Returns None when the query cannot be pushed down, the file is already
+    cached in memory, or it has journaled changes the file does not hold yet.
+    """
+    filters = _parse_filters(query)
+    if not filters or _file_signature(journal_path(file_path)) is not None:
+        return None
+    if _get_cached_df(file_path) is not None:
+        return None
+
+    try:
+        return pd.read_parquet(file_path, engine="pyarrow", filters=filters)
+    except Exception as e:
+        logger.debug(f"Falling back to a full read for query {query!r}: {str(e)}")
+        return None
+
+# Frames with at least this many rows have simple queries evaluated by Polars,
+# whose multithreaded kernels outrun pandas' single-threaded evaluation
+POLARS_MIN_ROWS = 100_000
+_POLARS_OPS = {
+    "==": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Polars copies of the columns queried so far on the most recently queried
+# DataFrame, as (weakref, {column: Series}). A column Polars cannot convert,
+# such as an object column of mixed types, is stored as None so later
+# queries skip the conversion attempt.
+_polars_frame: Optional[tuple] = None
+
+def _polars_columns(df: pd.DataFrame, names: list) -> Optional[list]:
+    """Return Polars copies of some columns of df, or None if any cannot be converted"""
+    global _polars_frame
+    import polars as pl
+    with _query_cache_lock:
+        if _polars_frame is None or _polars_frame[0]() is not df:
+            _polars_frame = (weakref.ref(df), {})
+        converted = _polars_frame[1]
+        for name in names:
+            if name not in converted:
+                try:
+                    converted[name] = pl.from_pandas(df[name])
+                except Exception as e:
+                    logger.debug(f"Column {name!r} is queried with pandas: {str(e)}")
+                    converted[name] = None
+        columns = [converted[name] for name in names]
+    return None if any(column is None for column in columns) else columns
+
+def _polars_positions(df: pd.DataFrame, expr: str) -> Optional[np.ndarray]:
+    """
+    Evaluate a simple query on Polars copies of the columns of a large
+    DataFrame it filters on.
+    Returns the matching row positions, or None when Polars is not used.
+    """
+    if not HAS_POLARS or len(df) < POLARS_MIN_ROWS:
+        return None
+    filters = _parse_filters(expr)
+    if not filters or any(column not in df.columns for column, _, _ in filters):
+        return None
+
+    import polars as pl
+    try:
+        names = list(dict.fromkeys(column for column, _, _ in filters))
+        columns = _polars_columns(df, names)
+        if columns is None:
+            return None
+        pl_df = pl.DataFrame(columns)
+
+        terms = [
+            pl.col(column).is_in(value) if op == "in" else _POLARS_OPS[op](pl.col(column), value)
+            for column, op, value in filters
+        ]
+        mask = pl_df.select(pl.all_horizontal(terms).fill_null(False)).to_series()
+        return np.flatnonzero(mask.to_numpy())
+    except Exception as e:
+        logger.debug(f"Falling back to pandas for query {expr!r}: {str(e)}")
+        return None
+
+# Row positions matched by recent queries, keyed by (id(df), expression).
+# Cached DataFrames are never mutated in place, so a hit stays valid for as
+# long as the weak reference still points at the same object.
+_QUERY_CACHE_SIZE = 128
+_query_cache: OrderedDict[tuple, tuple] = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+def run_query(df: pd.DataFrame, expr: str) -> pd.DataFrame:
+    """Run a pandas query, reusing the result of an identical earlier query on the same DataFrame"""
+    key = (id(df), expr)
+    with _query_cache_lock:
+        hit = _query_cache.get(key)
+        if hit is not None and hit[0]() is df:
+            _query_cache.move_to_end(key)
+            return df.take(hit[1])
+
+    positions = _polars_positions(df, expr)
+    if positions is None:
+        mask = df.eval(expr, engine=QUERY_ENGINE)
+        if not isinstance(mask, pd.Series) or not pd.api.types.is_bool_dtype(mask):
+            # Let pandas raise its usual error for non-boolean expressions
+            return df.query(expr, engine=QUERY_ENGINE)
+        positions = np.flatnonzero(mask.to_numpy(dtype=bool, na_value=False))
+
+    with _query_cache_lock:
+        # Every mutation replaces the cached DataFrame, so drop the results
+        # of frames that have since been freed instead of waiting for the LRU
+        for dead in [k for k, (ref, _) in _query_cache.items() if ref() is None]:
+            del _query_cache[dead]
+        _query_cache[key] = (weakref.ref(df), positions)
+        _query_cache.move_to_end(key)
+        while len(_query_cache) > _QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return df.take(positions)
+
+def records_to_json(df: pd.DataFrame) -> str:
+    """Serialize the rows of a DataFrame as a JSON array of records, with ISO dates"""
+    return df.to_json(orient="records", date_format="iso")
+
+# Content hash and on-disk signature of the last DataFrame written to each file
+_last_write: dict[str, tuple] = {}
+
+def _frame_hash(df: pd.DataFrame) -> Optional[tuple]:
+    """Hash the part of a DataFrame that ends up in the file, or None if it is unhashable"""
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        return None
+    # Digest the row hashes in order, so reordered rows count as a change
+    digest = hashlib.blake2b(row_hashes.tobytes()).digest()
+    return (tuple(df.columns), tuple(map(str, df.dtypes)), digest)
+
 def write_file(df: pd.DataFrame, file_path: str):
-    """Write the DataFrame back to file based on format"""
-    file_ext = file_path.split('.')[-1].lower()
+    """
+    Write the DataFrame back to file based on format.
+    The data goes to a temporary file that replaces the original once it is
+    fully on disk, and the write is skipped entirely when the content is
+    unchanged since the last write.
+    """
+    file_ext = file_extension(file_path)
+    content_hash = _frame_hash(df)
+    if content_hash is not None and _last_write.get(file_path) == (content_hash, _file_signature(file_path)):
+        logger.debug(f"Skipping write of unchanged file: {file_path}")
+    else:
+        tmp_path = file_path + ".tmp"
+        try:
+            if file_ext not in _WRITERS:
+                raise ValueError(f"Writing .{file_ext} files is not supported")
+            with open(tmp_path, "wb") as f:
+                _WRITERS[file_ext](df, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            logger.error(f"Error writing file: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        _last_write[file_path] = (content_hash, _file_signature(file_path))
+
+    # The file is written without its index, so a fresh read would number
+    # rows from zero again; keep the cached copy consistent with that.
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        df = df.reset_index(drop=True)
+    _set_cached_df(file_path, df)
+
+# Mutations are appended to a journal next to the data file and replayed on
+# read, so a single-row edit costs one appended line instead of rewriting the
+# whole workbook. The journal is merged back into the data file ("compacted")
+# once it grows past these limits.
+JOURNAL_MAX_BYTES = 256 * 1024
+JOURNAL_MAX_ENTRIES = 500
+
+# Number of entries in each file's journal, or 0 when it has to be restarted
+_journal_entries: dict[str, int] = {}
+_journal_lock = threading.Lock()
+
+def journal_path(file_path: str) -> str:
+    """Return the path of the mutation journal for a data file"""
+    return file_path + ".jrn"
+
+def _has_index(df: pd.DataFrame, index: Any) -> bool:
+    """
+    Check whether a row label exists.
+    A RangeIndex answers by arithmetic and any other index through its
+    hash table, which pandas builds once and keeps on the index itself.
+    """
+    try:
+        return index in df.index
+    except TypeError:
+        return False
+
+def apply_mutation(df: pd.DataFrame, entry: dict) -> pd.DataFrame:
+    """
+    Apply a journal entry to a DataFrame and return the result.
+    Updates are applied in place; deletes renumber the rows from zero, the
+    same way a fresh read of the rewritten file would.
+    """
+    if entry["op"] == "update":
+        # Scalar cell writes go through .at, which skips the .loc indexer
+        # machinery; callers have already checked the row and columns exist.
+        for column, value in entry["data"].items():
+            df.at[entry["index"], column] = value
+        return df
+
+    if entry["op"] == "delete":
+        id_column = entry.get("id_column", "id")
+        # Matching rows are located first and dropped by label, instead of
+        # copying every other row through a boolean mask
+        if "indices" in entry:
+            if id_column != "id":
+                df = df.drop(df.index[df[id_column].isin(set(entry["indices"])).to_numpy()])
+            else:
+                df = df.drop(entry["indices"])
+        elif id_column != "id":
+            positions = np.flatnonzero(df[id_column].eq(entry["index"]).to_numpy(dtype=bool, na_value=False))
+            df = df.drop(df.index[positions])
+        else:
+            df = df.drop(entry["index"])
+        df.index = pd.RangeIndex(len(df))
+        return df
+
+    raise ValueError(f"Unknown journal operation: {entry['op']}")
+
+def _read_journal(path: str) -> list[dict]:
+    """
+    Parse the lines of a journal.
+    A torn last line, left behind by an append that was interrupted by a
+    crash or a full disk, is cut off the file so later appends start clean.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    records = []
+    offset = 0
+    for line in data.splitlines(keepends=True):
+        try:
+            if line.strip():
+                records.append(json.loads(line))
+        except ValueError:
+            if offset + len(line) < len(data):
+                raise
+            logger.warning(f"Dropping incomplete last line of journal {path}")
+            if offset:
+                os.truncate(path, offset)
+            else:
+                os.remove(path)
+            break
+        offset += len(line)
+    return records
+
+def replay_journal(file_path: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the pending journal entries of a file to its freshly read DataFrame.
+    The journal starts with the signature of the data file it applies to; a
+    journal left over from before the data file was rewritten is ignored.
+    """
+    path = journal_path(file_path)
+    entries = 0
+    try:
+        records = _read_journal(path)
+    except FileNotFoundError:
+        records = []
+
+    if records and records[0].get("base") == list(_file_signature(file_path)):
+        for entry in records[1:]:
+            df = apply_mutation(df, entry)
+            entries += 1
+    elif records:
+        logger.warning(f"Ignoring stale journal {path}")
+
+    with _journal_lock:
+        _journal_entries[file_path] = entries
+    return df
+
+def compact_journal(file_path: str, df: pd.DataFrame):
+    """Write the current DataFrame to the data file and drop its journal"""
+    with _journal_lock:
+        write_file(df, file_path)
+        try:
+            os.remove(journal_path(file_path))
+        except FileNotFoundError:
+            pass
+        _journal_entries[file_path] = 0
+    _set_cached_df(file_path, df)
+
+def journal_mutation(file_path: str, df: pd.DataFrame, entries: list[dict]):
+    """
+    Record mutations that have already been applied to df.
+    The entries are appended to the journal in a single write and df becomes
+    the cached state of the file; the journal is compacted once it reaches
+    its size limits.
+    """
+    path = journal_path(file_path)
+    with _journal_lock:
+        count = _journal_entries.get(file_path, 0)
+        lines = [json.dumps(entry, default=str) + "\n" for entry in entries]
+        if not count:
+            lines.insert(0, json.dumps({"base": list(_file_signature(file_path))}) + "\n")
+        with open(path, "a" if count else "w", encoding="utf-8") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        count += len(entries)
+        _journal_entries[file_path] = count
+        needs_compaction = count >= JOURNAL_MAX_ENTRIES or os.path.getsize(path) >= JOURNAL_MAX_BYTES
+
+    if needs_compaction:
+        try:
+            compact_journal(file_path, df)
+            return
+        except Exception as e:
+            # The journal still holds every change, so nothing is lost
+            logger.error(f"Error compacting journal: {str(e)}")
+    _set_cached_df(file_path, df)
+
+def flush_journal(file_path: str):
+    """Merge any pending journal entries into the data file, e.g. on shutdown"""
+    if _file_signature(journal_path(file_path)) is None:
+        return
     try:
-        if file_ext in ["xls", "xlsx"]:
-            df.to_excel(file_path, index=False)
-        else:  # csv
-            df.to_csv(file_path, index=False)
+        df = read_file(file_path)
+        if _journal_entries.get(file_path):
+            compact_journal(file_path, df)
+        else:
+            # A stale or empty journal has nothing to merge; rewriting the
+            # file would only lose what to_excel cannot round-trip, such as
+            # other sheets and formatting
+            with _journal_lock:
+                try:
+                    os.remove(journal_path(file_path))
+                except FileNotFoundError:
+                    pass
     except Exception as e:
-        logger.error(f"Error writing file: {str(e)}")
-        raise
+        # The journal is kept and replayed on the next start
+        logger.error(f"Error compacting journal: {str(e)}")
+
+def migrate_legacy_excel(file_path: str) -> str:
+    """
+    Convert a legacy .xls file to a Parquet copy next to it, once.
+    Returns the path the server should work with from now on.
+    """
+    if not HAS_PYARROW:
+        logger.warning("pyarrow is not installed, serving the .xls file directly")
+        return file_path
+
+    parquet_path = file_path + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+        return parquet_path
+
+    if os.path.exists(parquet_path):
+        logger.warning(
+            f"{file_path} is newer than {parquet_path}, replacing the Parquet copy "
+            "and any changes made to it through the server"
+        )
+    if os.path.exists(journal_path(parquet_path)):
+        logger.warning(f"Discarding pending journal {journal_path(parquet_path)}")
+
+    try:
+        df = pd.read_excel(file_path, engine="xlrd")
+        # Parquet only supports string column names
+        df.columns = df.columns.map(str)
+        df.to_parquet(parquet_path, engine="pyarrow", compression="snappy", index=False)
+    except Exception as e:
+        logger.warning(f"Could not migrate {file_path} to Parquet: {str(e)}")
+        return file_path
+
+    logger.info(f"Migrated {file_path} to {parquet_path}")
+    return parquet_path
 
 # Initialize the Server
 server = Server("excel-mcp")
@@ -150,7 +725,7 @@ async def handle_list_prompts() -> list[types.Prompt]:
                     name="operation",
                     description="Operation to perform (query, update, delete, list)",
                     required=True,
-                    choices=["query", "update_item", "delete_item", "list_columns"]
+                    choices=["query", "update_item", "delete_item", "update_items", "delete_items", "list_columns"]
                 ) 
             ],
         )
@@ -226,6 +801,40 @@ async def handle_list_tools() -> list[types.Tool]:
                 "required": ["index"],
             },
         ),
+        types.Tool(
+            name="update_items",
+            description="Update several rows in Excel/CSV file in one operation",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "description": "Rows to update",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "index": {"type": "integer", "description": "Row index to update"},
+                                "data": {"type": "object", "description": "Data to update with"},
+                            },
+                            "required": ["index", "data"],
+                        },
+                    },
+                },
+                "required": ["items"],
+            },
+        ),
+        types.Tool(
+            name="delete_items",
+            description="Delete several rows from Excel/CSV file in one operation",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "indices": {"type": "array", "items": {"type": "integer"}, "description": "Row indices to delete"},
+                    "id_column": {"type": "string", "description": "Optional ID column name", "default": "id"},
+                },
+                "required": ["indices"],
+            },
+        ),
         types.Tool(
             name="list_columns",
             description="List all columns in Excel/CSV file",
@@ -236,6 +845,133 @@ async def handle_list_tools() -> list[types.Tool]:
         )
     ]
 
+def _tool_query(df: Optional[pd.DataFrame], arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Run a pandas query and return the matching rows as JSON records"""
+    result = None
+    if FILE_EXT == "parquet":
+        result = read_parquet_filtered(FILE_PATH, arguments["query"])
+    if result is None:
+        result = run_query(read_file(FILE_PATH), arguments["query"])
+    return [types.TextContent(type="text", text=records_to_json(result))]
+
+def _tool_update_item(df: Optional[pd.DataFrame], arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Update the cells of one row"""
+    df = df.copy(deep=False)
+    index = arguments["index"]
+    data = arguments["data"]
+
+    if not _has_index(df, index):
+        return [types.TextContent(type="text", text=f"Error: Index {index} not found")]
+
+    columns = set(df.columns)
+    for column in data:
+        if column not in columns:
+            return [types.TextContent(type="text", text=f"Error: Column {column} not found")]
+
+    entry = {"op": "update", "index": index, "data": data}
+    df = apply_mutation(df, entry)
+    journal_mutation(FILE_PATH, df, [entry])
+    return [types.TextContent(type="text", text="Item updated successfully")]
+
+def _tool_delete_item(df: Optional[pd.DataFrame], arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Delete one row by index or by the value of an id column"""
+    index = arguments["index"]
+    id_column = arguments.get("id_column", "id")
+
+    if df.empty:
+        return [types.TextContent(type="text", text="Error: Empty file")]
+
+    if id_column != "id":
+        if id_column not in df.columns:
+            return [types.TextContent(type="text", text=f"Error: Column {id_column} not found")]
+    else:
+        if not _has_index(df, index):
+            return [types.TextContent(type="text", text=f"Error: Index {index} not found")]
+
+    entry = {"op": "delete", "index": index, "id_column": id_column}
+    result = apply_mutation(df, entry)
+    # The id column is scanned once, by the delete itself: if no row was
+    # dropped, the id does not exist
+    if len(result) == len(df):
+        return [types.TextContent(type="text", text=f"Error: Index {index} not found")]
+    journal_mutation(FILE_PATH, result, [entry])
+    return [types.TextContent(type="text", text="Item deleted successfully")]
+
+def _tool_update_items(df: Optional[pd.DataFrame], arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Update several rows, reporting success per row"""
+    df = df.copy(deep=False)
+    columns = set(df.columns)
+    results = []
+    entries = []
+    for item in arguments["items"]:
+        index = item["index"]
+        missing = [column for column in item["data"] if column not in columns]
+        if not _has_index(df, index):
+            results.append({"index": index, "success": False, "error": f"Index {index} not found"})
+        elif missing:
+            results.append({"index": index, "success": False, "error": f"Column {missing[0]} not found"})
+        else:
+            results.append({"index": index, "success": True})
+            entries.append({"op": "update", "index": index, "data": item["data"]})
+
+    # Cells are assigned one by one rather than through df.update,
+    # which would silently skip null values
+    for entry in entries:
+        df = apply_mutation(df, entry)
+    if entries:
+        journal_mutation(FILE_PATH, df, entries)
+    return [types.TextContent(type="text", text=json.dumps(results, default=str))]
+
+def _tool_delete_items(df: Optional[pd.DataFrame], arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Delete several rows, reporting success per row"""
+    indices = list(dict.fromkeys(arguments["indices"]))
+    id_column = arguments.get("id_column", "id")
+
+    if df.empty:
+        return [types.TextContent(type="text", text="Error: Empty file")]
+
+    if id_column != "id":
+        if id_column not in df.columns:
+            return [types.TextContent(type="text", text=f"Error: Column {id_column} not found")]
+        column = df[id_column]
+        existing = set(column[column.isin(indices)].tolist())
+    else:
+        existing = {index for index in indices if _has_index(df, index)}
+
+    results = []
+    for index in indices:
+        if index in existing:
+            results.append({"index": index, "success": True})
+        else:
+            results.append({"index": index, "success": False, "error": f"Index {index} not found"})
+
+    found = [index for index in indices if index in existing]
+    if found:
+        entry = {"op": "delete", "indices": found, "id_column": id_column}
+        df = apply_mutation(df, entry)
+        journal_mutation(FILE_PATH, df, [entry])
+    return [types.TextContent(type="text", text=json.dumps(results, default=str))]
+
+def _tool_list_columns(df: Optional[pd.DataFrame], arguments: dict[str, Any]) -> list[types.TextContent]:
+    """List the column names of the file"""
+    results = read_columns(FILE_PATH)
+    return [types.TextContent(type="text", text=f"{results}")]
+
+# Tool name -> handler, so dispatch is a single dict lookup
+_TOOL_HANDLERS: dict[str, Callable[[Optional[pd.DataFrame], dict[str, Any]], list[types.TextContent]]] = {
+    "query": _tool_query,
+    "update_item": _tool_update_item,
+    "delete_item": _tool_delete_item,
+    "update_items": _tool_update_items,
+    "delete_items": _tool_delete_items,
+    "list_columns": _tool_list_columns,
+}
+
+# Tools that work on the whole DataFrame. It is read once by the dispatcher
+# and handed to the handler; query and list_columns read what they need
+# themselves, since they can often avoid loading every row.
+_FRAME_TOOLS = {"update_item", "delete_item", "update_items", "delete_items"}
+
 @server.call_tool()
 async def handle_call_tool(
     name: str, 
@@ -247,56 +983,11 @@ async def handle_call_tool(
             if not name == "list_columns":
                 raise ValueError("Missing arguments")
 
-        if name == "query":
-            df = read_file(FILE_PATH)
-            result = df.query(arguments["query"])
-            return [types.TextContent(type="text", text=str(result.to_dict('records')))]
-
-        elif name == "update_item":
-            df = read_file(FILE_PATH)
-            index = arguments["index"]
-            data = arguments["data"]
-            
-            if index not in df.index:
-                return [types.TextContent(type="text", text=f"Error: Index {index} not found")]
-                
-            for column, value in data.items():
-                if column not in df.columns:
-                    return [types.TextContent(type="text", text=f"Error: Column {column} not found")]
-                df.loc[index, column] = value
-                
-            write_file(df, FILE_PATH)
-            return [types.TextContent(type="text", text="Item updated successfully")]
-
-        elif name == "delete_item":
-            df = read_file(FILE_PATH)
-            index = arguments["index"]
-            id_column = arguments.get("id_column", "id")
-            
-            if df.empty:
-                return [types.TextContent(type="text", text="Error: Empty file")]
-            
-            if id_column != "id":
-                if id_column not in df.columns:
-                    return [types.TextContent(type="text", text=f"Error: Column {id_column} not found")]
-                if index not in df[id_column].values:
-                    return [types.TextContent(type="text", text=f"Error: Index {index} not found")]
-                df = df[df[id_column] != index]
-            else:
-                if index not in df.index:
-                    return [types.TextContent(type="text", text=f"Error: Index {index} not found")]
-                df = df.drop(index)
-            
-            write_file(df, FILE_PATH)
-            return [types.TextContent(type="text", text="Item deleted successfully")]
-        
-        elif name == "list_columns":
-            df = read_file(FILE_PATH)
-            results = df.columns.to_list()
-            return [types.TextContent(type="text", text=f"{results}")]
-            
-        else:
+        handler = _TOOL_HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
+        df = read_file(FILE_PATH) if name in _FRAME_TOOLS else None
+        return handler(df, arguments)
             
     except Exception as e:
         return [types.TextContent(type="text", text=f"Error: {str(e)}")]
@@ -315,28 +1006,36 @@ async def main():
     """Main entry point for the MCP server."""
     args = parse_arguments()
     
-    global FILE_PATH
+    global FILE_PATH, FILE_EXT
     FILE_PATH = os.path.abspath(args.file_path)
     
-    if not validate_file(FILE_PATH):
+    FILE_EXT = validate_file(FILE_PATH)
+    if not FILE_EXT:
         sys.exit(1)
 
+    if FILE_EXT == "xls":
+        FILE_PATH = migrate_legacy_excel(FILE_PATH)
+        FILE_EXT = validate_file(FILE_PATH)
+
     setup_signal_handling()
     
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        logger.info("Server running with stdio transport")
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="excel-mcp",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            logger.info("Server running with stdio transport")
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="excel-mcp",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        flush_journal(FILE_PATH)
 
 if __name__ == "__main__":
     try:
@@ -1,18 +1,29 @@
 import pytest
 import pandas as pd
+import numpy as np
 import os
-import sys
 import json
-from unittest.mock import patch, Mock, AsyncMock
+import csv
+import shutil
+from unittest.mock import patch
 import asyncio
+from types import MappingProxyType
+from openpyxl import Workbook
 
-# Add the src directory to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
+import src.server
 from src.server import (
     validate_file,
     read_file,
     write_file,
+    read_columns,
+    read_parquet_filtered,
+    run_query,
+    records_to_json,
+    journal_path,
+    journal_mutation,
+    flush_journal,
+    apply_mutation,
+    migrate_legacy_excel,
     handle_call_tool,
     handle_list_tools,
     handle_get_prompt,
@@ -25,62 +36,360 @@ SAMPLE_DATA = pd.DataFrame({
     'name': ['John', 'Jane', 'Bob'],
     'age': [25, 30, 35]
 })
+SAMPLE_DTYPES = SAMPLE_DATA.dtypes.to_dict()
+# Ground-truth column arrays, so comparisons skip assert_frame_equal's checks.
+# SAMPLE_DATA itself is never mutated: tests hand out shallow copies, which
+# copy-on-write (enabled by src.server) keeps independent.
+SAMPLE_COLS = {column: SAMPLE_DATA[column].to_numpy() for column in SAMPLE_DATA.columns}
 
-@pytest.fixture
-def sample_excel_file(tmp_path):
-    """Create a temporary Excel file for testing"""
-    file_path = tmp_path / "test.xlsx"
-    SAMPLE_DATA.to_excel(file_path, index=False)
+# Tool arguments shared by the handler tests; read-only so no handler can
+# change them for the next test
+_QUERY_ARGS = MappingProxyType({"query": "age > 30"})
+_UPDATE_ARGS = MappingProxyType({"index": 1, "data": {"name": "Updated Name"}})
+_DELETE_ARGS = MappingProxyType({"index": 1})
+_LIST_COLUMNS_ARGS = MappingProxyType({})
+
+def _assert_same(df):
+    """Assert that a DataFrame holds exactly the sample data"""
+    assert list(df.columns) == list(SAMPLE_COLS)
+    for column, expected in SAMPLE_COLS.items():
+        assert df[column].dtype == SAMPLE_DTYPES[column]
+        assert np.array_equal(df[column].to_numpy(), expected)
+
+@pytest.fixture(scope="session")
+def sample_excel_file(tmp_path_factory):
+    """Create a temporary Excel file shared by the whole test session"""
+    file_path = tmp_path_factory.mktemp("data") / "test.xlsx"
+    # Stream the rows through a write-only workbook instead of to_excel
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(SAMPLE_DATA.columns))
+    for row in SAMPLE_DATA.itertuples(index=False):
+        ws.append(row)
+    wb.save(str(file_path))
+    return str(file_path)
+
+@pytest.fixture(scope="session")
+def sample_csv_file(tmp_path_factory):
+    """Create a temporary CSV file shared by the whole test session"""
+    file_path = tmp_path_factory.mktemp("data") / "test.csv"
+    with open(file_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SAMPLE_DATA.columns)
+        writer.writerows(SAMPLE_DATA.itertuples(index=False, name=None))
     return str(file_path)
 
 @pytest.fixture
-def sample_csv_file(tmp_path):
-    """Create a temporary CSV file for testing"""
+def writable_csv_file(sample_csv_file, tmp_path):
+    """Copy of the sample CSV file that a test may modify"""
     file_path = tmp_path / "test.csv"
-    SAMPLE_DATA.to_csv(file_path, index=False)
+    shutil.copy(sample_csv_file, file_path)
     return str(file_path)
 
 class TestFileValidation:
-    def test_validate_file_excel(self, sample_excel_file):
-        result = validate_file(sample_excel_file)
-        assert result == "xlsx"
-
-    def test_validate_file_csv(self, sample_csv_file):
-        result = validate_file(sample_csv_file)
-        assert result == "csv"
+    @pytest.fixture(scope="session")
+    def nonexistent_file(self):
+        return "nonexistent.xlsx"
 
-    def test_validate_file_nonexistent(self):
-        result = validate_file("nonexistent.xlsx")
-        assert result is None
-
-    def test_validate_file_invalid_format(self, tmp_path):
-        invalid_file = tmp_path / "test.txt"
+    @pytest.fixture(scope="session")
+    def invalid_format_file(self, tmp_path_factory):
+        invalid_file = tmp_path_factory.mktemp("data") / "test.txt"
         invalid_file.write_text("test")
-        result = validate_file(str(invalid_file))
-        assert result is None
+        return str(invalid_file)
+
+    @pytest.mark.parametrize("path_fixture,expected", [
+        ("sample_excel_file", "xlsx"),
+        ("sample_csv_file", "csv"),
+        ("nonexistent_file", None),
+        ("invalid_format_file", None),
+    ])
+    def test_validate_file(self, request, path_fixture, expected):
+        assert validate_file(request.getfixturevalue(path_fixture)) == expected
 
+# Keep the Excel-heavy tests on one xdist worker (with --dist loadgroup), so
+# the session fixture files are only built there
+@pytest.mark.xdist_group("excel")
 class TestFileOperations:
     def test_read_excel_file(self, sample_excel_file):
         df = read_file(sample_excel_file)
-        pd.testing.assert_frame_equal(df, SAMPLE_DATA)
+        _assert_same(df)
 
     def test_read_csv_file(self, sample_csv_file):
         df = read_file(sample_csv_file)
-        pd.testing.assert_frame_equal(df, SAMPLE_DATA)
+        _assert_same(df)
+
+    def test_read_csv_file_with_short_row(self, tmp_path):
+        file_path = tmp_path / "short.csv"
+        file_path.write_text("id,name,age\n1,John,25\n2,Jane\n")
+        df = read_file(str(file_path))
+        assert df["name"].tolist() == ["John", "Jane"]
+        assert df["age"].isna().tolist() == [False, True]
+
+    def test_read_csv_file_keeps_dates_as_text(self, tmp_path):
+        file_path = tmp_path / "dates.csv"
+        file_path.write_text("id,joined,at\n1,2020-01-01,2020-01-01 10:00\n2,2021-06-15,2021-06-15 11:30\n")
+        df = read_file(str(file_path))
+        assert df["joined"].tolist() == ["2020-01-01", "2021-06-15"]
+        assert df["at"].tolist() == ["2020-01-01 10:00", "2021-06-15 11:30"]
 
     def test_write_excel_file(self, tmp_path):
+        # Capture the workbook instead of serializing it and parsing it back
+        saved = []
+        with patch('openpyxl.Workbook.save', autospec=True, side_effect=lambda wb, *a: saved.append(wb)):
+            write_file(SAMPLE_DATA, str(tmp_path / "output.xlsx"))
+        rows = list(saved[0].active.values)
+        assert rows[0] == tuple(SAMPLE_DATA.columns)
+        assert rows[1:] == list(SAMPLE_DATA.itertuples(index=False, name=None))
+
+    def test_write_excel_file_roundtrip(self, tmp_path):
         file_path = str(tmp_path / "output.xlsx")
         write_file(SAMPLE_DATA, file_path)
-        result_df = pd.read_excel(file_path)
-        pd.testing.assert_frame_equal(result_df, SAMPLE_DATA)
+        result_df = pd.read_excel(file_path, engine="openpyxl", dtype=SAMPLE_DTYPES)
+        _assert_same(result_df)
 
     def test_write_csv_file(self, tmp_path):
         file_path = str(tmp_path / "output.csv")
         write_file(SAMPLE_DATA, file_path)
-        result_df = pd.read_csv(file_path)
-        pd.testing.assert_frame_equal(result_df, SAMPLE_DATA)
+        with open(file_path, newline="") as f:
+            assert f.read() == SAMPLE_DATA.to_csv(index=False, lineterminator=os.linesep)
+
+    def test_write_file_is_atomic(self, tmp_path):
+        file_path = str(tmp_path / "output.csv")
+        write_file(SAMPLE_DATA, file_path)
+        assert os.listdir(tmp_path) == ["output.csv"]
+
+    def test_write_file_skips_unchanged_content(self, tmp_path):
+        file_path = str(tmp_path / "output.csv")
+        write_file(SAMPLE_DATA, file_path)
+        with patch('src.server.os.replace') as mock_replace:
+            write_file(SAMPLE_DATA.copy(deep=False), file_path)
+            assert not mock_replace.called
+            write_file(SAMPLE_DATA.head(2), file_path)
+            assert mock_replace.called
+
+    def test_write_file_detects_reordered_rows(self, tmp_path):
+        file_path = str(tmp_path / "output.csv")
+        write_file(SAMPLE_DATA, file_path)
+        write_file(SAMPLE_DATA.iloc[[1, 0, 2]], file_path)
+        assert pd.read_csv(file_path)["name"].tolist() == ["Jane", "John", "Bob"]
+
+    def test_write_and_read_parquet_file(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        file_path = str(tmp_path / "output.parquet")
+        write_file(SAMPLE_DATA, file_path)
+        _assert_same(pd.read_parquet(file_path))
+
+    def test_migrate_legacy_excel(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        xls_path = str(tmp_path / "legacy.xls")
+        with patch('src.server.pd.read_excel', return_value=SAMPLE_DATA.copy(deep=False)):
+            result = migrate_legacy_excel(xls_path)
+        assert result == xls_path + ".parquet"
+        _assert_same(read_file(result))
+
+    def test_migrate_legacy_excel_warns_on_replace(self, tmp_path, caplog):
+        pytest.importorskip("pyarrow")
+        xls_path = str(tmp_path / "legacy.xls")
+        parquet_path = xls_path + ".parquet"
+        SAMPLE_DATA.to_parquet(parquet_path, index=False)
+        with open(journal_path(parquet_path), "w") as f:
+            f.write("{}\n")
+        with patch('src.server.os.path.getmtime', side_effect=[0, 1]), \
+                patch('src.server.pd.read_excel', return_value=SAMPLE_DATA.copy(deep=False)):
+            migrate_legacy_excel(xls_path)
+        assert "replacing the Parquet copy" in caplog.text
+        assert "Discarding pending journal" in caplog.text
+
+    def test_read_columns_uses_cache(self, sample_csv_file):
+        read_file(sample_csv_file)
+        with patch('src.server.pd.read_csv') as mock_read_csv:
+            assert read_columns(sample_csv_file) == ["id", "name", "age"]
+        assert not mock_read_csv.called
+
+    def test_read_columns_excel(self, sample_excel_file):
+        assert read_columns(sample_excel_file) == ["id", "name", "age"]
+
+    def test_read_columns_csv(self, sample_csv_file):
+        assert read_columns(sample_csv_file) == ["id", "name", "age"]
+
+    def test_read_columns_parquet(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        file_path = str(tmp_path / "test.parquet")
+        SAMPLE_DATA.to_parquet(file_path, index=False)
+        assert read_columns(file_path) == ["id", "name", "age"]
+
+    @pytest.mark.parametrize("query,expected", [
+        ("age > 28", ["Jane", "Bob"]),
+        ("age > 28 and name == 'Bob'", ["Bob"]),
+        ("(id >= 2) & (age < 35)", ["Jane"]),
+        ("name in ['John', 'Bob']", ["John", "Bob"]),
+    ])
+    def test_read_parquet_filtered(self, tmp_path, query, expected):
+        pytest.importorskip("pyarrow")
+        file_path = str(tmp_path / "test.parquet")
+        SAMPLE_DATA.to_parquet(file_path, index=False)
+        result = read_parquet_filtered(file_path, query)
+        assert result["name"].tolist() == expected
+
+    def test_read_parquet_filtered_skips_journaled_file(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        file_path = str(tmp_path / "test.parquet")
+        SAMPLE_DATA.to_parquet(file_path, index=False)
+        entry = {"op": "update", "index": 2, "data": {"age": 20}}
+        journal_mutation(file_path, apply_mutation(read_file(file_path).copy(), entry), [entry])
+
+        # After a restart nothing is cached, but the journal still applies
+        with patch('src.server._df_cache', {}):
+            assert read_parquet_filtered(file_path, "age > 28") is None
+
+    @pytest.mark.parametrize("query", ["name != 'Bob'", "age > id", "age * 2 > 30", "age > @limit"])
+    def test_read_parquet_filtered_unsupported(self, tmp_path, query):
+        pytest.importorskip("pyarrow")
+        file_path = str(tmp_path / "test.parquet")
+        SAMPLE_DATA.to_parquet(file_path, index=False)
+        assert read_parquet_filtered(file_path, query) is None
+
+    def test_run_query(self):
+        result = run_query(SAMPLE_DATA, "age > 28")
+        pd.testing.assert_frame_equal(result, SAMPLE_DATA.query("age > 28"))
+
+    def test_run_query_reuses_result(self):
+        df = SAMPLE_DATA.copy(deep=False)
+        run_query(df, "age > 28")
+        with patch.object(pd.DataFrame, "eval") as mock_eval:
+            result = run_query(df, "age > 28")
+        assert not mock_eval.called
+        assert result["name"].tolist() == ["Jane", "Bob"]
+
+    def test_run_query_drops_results_of_freed_frames(self):
+        df = SAMPLE_DATA.copy(deep=False)
+        run_query(df, "age > 28")
+        del df
+        run_query(SAMPLE_DATA, "age < 28")
+        assert all(ref() is not None for ref, _ in src.server._query_cache.values())
+
+    def test_run_query_with_polars(self):
+        pytest.importorskip("polars")
+        df = SAMPLE_DATA.copy(deep=False)
+        with patch('src.server.POLARS_MIN_ROWS', 0), patch.object(pd.DataFrame, "eval") as mock_eval:
+            result = run_query(df, "age > 28 and name in ['Jane']")
+        assert not mock_eval.called
+        pd.testing.assert_frame_equal(result, SAMPLE_DATA.iloc[[1]])
+
+    def test_run_query_remembers_polars_failure(self):
+        pl = pytest.importorskip("polars")
+        df = SAMPLE_DATA.assign(code=[1, "a", 2.5])
+        with patch('src.server.POLARS_MIN_ROWS', 0), \
+                patch.object(pl, "from_pandas", wraps=pl.from_pandas) as mock_from_pandas:
+            first = run_query(df, "code == 1")
+            second = run_query(df, "code == 'a'")
+        assert mock_from_pandas.call_count == 1
+        assert first["name"].tolist() == ["John"]
+        assert second["name"].tolist() == ["Jane"]
+
+    def test_records_to_json(self):
+        df = SAMPLE_DATA.assign(joined=pd.to_datetime(["2020-01-01", "2021-06-15", "2022-12-31"]))
+        records = json.loads(records_to_json(df))
+        assert records[0] == {"id": 1, "name": "John", "age": 25, "joined": "2020-01-01T00:00:00.000"}
+        assert [r["joined"] for r in records[1:]] == ["2021-06-15T00:00:00.000", "2022-12-31T00:00:00.000"]
+
+    def test_read_file_uses_cache(self, sample_csv_file):
+        assert read_file(sample_csv_file) is read_file(sample_csv_file)
+
+    def test_read_file_cache_invalidated_on_change(self, writable_csv_file):
+        read_file(writable_csv_file)
+        SAMPLE_DATA.head(1).to_csv(writable_csv_file, index=False)
+        df = read_file(writable_csv_file)
+        assert len(df) == 1
+
+    def test_write_file_refreshes_cache(self, tmp_path):
+        file_path = str(tmp_path / "output.csv")
+        write_file(SAMPLE_DATA.drop(1), file_path)
+        df = read_file(file_path)
+        assert df["name"].tolist() == ["John", "Bob"]
+        assert df.index.tolist() == [0, 1]
+
+class TestJournal:
+    def test_mutation_is_journaled(self, writable_csv_file):
+        entry = {"op": "update", "index": 1, "data": {"name": "Updated Name"}}
+        df = apply_mutation(read_file(writable_csv_file).copy(), entry)
+        journal_mutation(writable_csv_file, df, [entry])
+
+        assert os.path.exists(journal_path(writable_csv_file))
+        _assert_same(pd.read_csv(writable_csv_file))
+        assert read_file(writable_csv_file)["name"].tolist() == ["John", "Updated Name", "Bob"]
+
+    def test_journal_is_replayed(self, writable_csv_file, tmp_path):
+        entry = {"op": "delete", "index": 0, "id_column": "id"}
+        df = apply_mutation(read_file(writable_csv_file), entry)
+        journal_mutation(writable_csv_file, df, [entry])
+
+        # A copy of the file and its journal is not cached yet
+        copy_path = str(tmp_path / "copy.csv")
+        shutil.copy2(writable_csv_file, copy_path)
+        shutil.copy2(journal_path(writable_csv_file), journal_path(copy_path))
+        result = read_file(copy_path)
+        assert result["name"].tolist() == ["Jane", "Bob"]
+        assert result.index.tolist() == [0, 1]
+
+    def test_journal_is_compacted(self, writable_csv_file):
+        entry = {"op": "delete", "index": 2, "id_column": "id"}
+        df = apply_mutation(read_file(writable_csv_file), entry)
+        with patch('src.server.JOURNAL_MAX_ENTRIES', 1):
+            journal_mutation(writable_csv_file, df, [entry])
+
+        assert not os.path.exists(journal_path(writable_csv_file))
+        assert pd.read_csv(writable_csv_file)["name"].tolist() == ["John", "Jane"]
+
+    def test_torn_journal_line_is_dropped(self, writable_csv_file, tmp_path):
+        entry = {"op": "delete", "index": 0, "id_column": "id"}
+        df = apply_mutation(read_file(writable_csv_file), entry)
+        journal_mutation(writable_csv_file, df, [entry])
+        with open(journal_path(writable_csv_file), "a") as f:
+            f.write('{"op": "update", "ind')
+
+        copy_path = str(tmp_path / "copy.csv")
+        shutil.copy2(writable_csv_file, copy_path)
+        shutil.copy2(journal_path(writable_csv_file), journal_path(copy_path))
+        assert read_file(copy_path)["name"].tolist() == ["Jane", "Bob"]
+        with open(journal_path(copy_path)) as f:
+            assert f.read().endswith("\n")
+
+    def test_flush_journal(self, writable_csv_file):
+        entry = {"op": "delete", "index": 0, "id_column": "id"}
+        df = apply_mutation(read_file(writable_csv_file), entry)
+        journal_mutation(writable_csv_file, df, [entry])
+        flush_journal(writable_csv_file)
+
+        assert not os.path.exists(journal_path(writable_csv_file))
+        assert pd.read_csv(writable_csv_file)["name"].tolist() == ["Jane", "Bob"]
+
+    def test_flush_stale_journal_keeps_file(self, writable_csv_file):
+        entry = {"op": "delete", "index": 0, "id_column": "id"}
+        df = apply_mutation(read_file(writable_csv_file), entry)
+        journal_mutation(writable_csv_file, df, [entry])
+        SAMPLE_DATA.to_csv(writable_csv_file, index=False, lineterminator="\r\n")
+        with open(writable_csv_file, "rb") as f:
+            before = f.read()
+
+        flush_journal(writable_csv_file)
+        assert not os.path.exists(journal_path(writable_csv_file))
+        with open(writable_csv_file, "rb") as f:
+            assert f.read() == before
+
+    def test_delete_by_nullable_id_column(self):
+        df = SAMPLE_DATA.assign(code=pd.array(["a", None, "c"], dtype="string"))
+        result = apply_mutation(df, {"op": "delete", "index": "c", "id_column": "code"})
+        assert result["name"].tolist() == ["John", "Jane"]
+
+    def test_stale_journal_is_ignored(self, writable_csv_file):
+        entry = {"op": "delete", "index": 0, "id_column": "id"}
+        df = apply_mutation(read_file(writable_csv_file), entry)
+        journal_mutation(writable_csv_file, df, [entry])
+
+        SAMPLE_DATA.to_csv(writable_csv_file, index=False, lineterminator="\r\n")
+        assert read_file(writable_csv_file)["name"].tolist() == ["John", "Jane", "Bob"]
 
-@pytest.mark.asyncio
 class TestServerHandlers:
     # async def test_list_resources(self):
     #     resources = await handle_list_resources()
@@ -113,68 +422,107 @@ class TestServerHandlers:
 
     async def test_list_tools(self):
         tools = await handle_list_tools()
-        assert len(tools) == 3
+        assert len(tools) == 6
         tool_names = {tool.name for tool in tools}
-        assert tool_names == {"query", "update_item", "delete_item"}
+        assert tool_names == {
+            "query", "update_item", "delete_item", "update_items", "delete_items", "list_columns"
+        }
 
-@pytest.mark.asyncio
 class TestToolHandlers:
-    @patch('src.server.FILE_PATH')
-    @patch('src.server.read_file')
-    async def test_query_tool(self, mock_read, mock_file_path, sample_excel_file):
-        mock_file_path.return_value = sample_excel_file
-        mock_read.return_value = SAMPLE_DATA
+    async def test_query_tool(self, monkeypatch, sample_excel_file):
+        monkeypatch.setattr('src.server.FILE_PATH', sample_excel_file)
+        monkeypatch.setattr('src.server.read_file', lambda *a, **k: SAMPLE_DATA)
 
-        result = await handle_call_tool("query", {"query": "age > 30"})
+        result = await handle_call_tool("query", _QUERY_ARGS)
         assert isinstance(result, list)
         assert len(result) == 1
         assert result[0].type == "text"
         assert "Bob" in result[0].text
+        assert json.loads(result[0].text) == [{"id": 3, "name": "Bob", "age": 35}]
 
-    @patch('src.server.FILE_PATH')
-    @patch('src.server.read_file')
-    @patch('src.server.write_file')
-    async def test_update_item_tool(self, mock_write, mock_read, mock_file_path, sample_excel_file):
-        mock_file_path.return_value = sample_excel_file
-        mock_read.return_value = SAMPLE_DATA.copy()
+    async def test_update_item_tool(self, monkeypatch, sample_excel_file):
+        calls = []
+        monkeypatch.setattr('src.server.FILE_PATH', sample_excel_file)
+        monkeypatch.setattr('src.server.read_file', lambda *a, **k: SAMPLE_DATA.copy(deep=False))
+        monkeypatch.setattr('src.server.journal_mutation', lambda *a: calls.append(a))
 
-        result = await handle_call_tool("update_item", {
-            "index": 1,
-            "data": {"name": "Updated Name"}
-        })
+        result = await handle_call_tool("update_item", _UPDATE_ARGS)
         
         assert isinstance(result, list)
         assert len(result) == 1
         assert result[0].type == "text"
         assert "successfully" in result[0].text
-        assert mock_write.called
+        assert calls
 
-    @patch('src.server.FILE_PATH')
-    @patch('src.server.read_file')
-    @patch('src.server.write_file')
-    async def test_delete_item_tool(self, mock_write, mock_read, mock_file_path, sample_excel_file):
-        mock_file_path.return_value = sample_excel_file
-        mock_read.return_value = SAMPLE_DATA.copy()
+    async def test_delete_item_tool(self, monkeypatch, sample_excel_file):
+        calls = []
+        monkeypatch.setattr('src.server.FILE_PATH', sample_excel_file)
+        monkeypatch.setattr('src.server.read_file', lambda *a, **k: SAMPLE_DATA.copy(deep=False))
+        monkeypatch.setattr('src.server.journal_mutation', lambda *a: calls.append(a))
 
-        result = await handle_call_tool("delete_item", {
-            "name": "John"
-        })
+        result = await handle_call_tool("delete_item", _DELETE_ARGS)
         
         assert isinstance(result, list)
         assert len(result) == 1
         assert result[0].type == "text"
         assert "successfully" in result[0].text
-        assert mock_write.called
+        assert calls
+
+    async def test_list_columns(self, monkeypatch, sample_excel_file):
+        monkeypatch.setattr('src.server.FILE_PATH', sample_excel_file)
+
+        result = await handle_call_tool("list_columns", _LIST_COLUMNS_ARGS)
+        assert result[0].text == "['id', 'name', 'age']"
+
+    async def test_delete_item_by_column_tool(self, monkeypatch, writable_csv_file):
+        monkeypatch.setattr('src.server.FILE_PATH', writable_csv_file)
+        missing = await handle_call_tool("delete_item", {"index": 99, "id_column": "age"})
+        result = await handle_call_tool("delete_item", {"index": 30, "id_column": "age"})
+
+        assert "not found" in missing[0].text
+        assert "successfully" in result[0].text
+        assert read_file(writable_csv_file)["name"].tolist() == ["John", "Bob"]
+
+    async def test_update_item_keeps_cached_frame(self, monkeypatch, writable_csv_file):
+        before = read_file(writable_csv_file)
+        monkeypatch.setattr('src.server.FILE_PATH', writable_csv_file)
+        await handle_call_tool("update_item", {"index": 0, "data": {"age": 26}})
+
+        assert before["age"].tolist() == [25, 30, 35]
+        assert read_file(writable_csv_file)["age"].tolist() == [26, 30, 35]
+
+    async def test_update_items_tool(self, monkeypatch, writable_csv_file):
+        monkeypatch.setattr('src.server.FILE_PATH', writable_csv_file)
+        result = await handle_call_tool("update_items", {"items": [
+            {"index": 0, "data": {"age": 26}},
+            {"index": 5, "data": {"age": 40}},
+            {"index": 2, "data": {"missing": 1}},
+        ]})
+
+        assert json.loads(result[0].text) == [
+            {"index": 0, "success": True},
+            {"index": 5, "success": False, "error": "Index 5 not found"},
+            {"index": 2, "success": False, "error": "Column missing not found"},
+        ]
+        assert read_file(writable_csv_file)["age"].tolist() == [26, 30, 35]
+
+    async def test_delete_items_tool(self, monkeypatch, writable_csv_file):
+        monkeypatch.setattr('src.server.FILE_PATH', writable_csv_file)
+        result = await handle_call_tool("delete_items", {"indices": [0, 2, 9]})
+
+        assert json.loads(result[0].text) == [
+            {"index": 0, "success": True},
+            {"index": 2, "success": True},
+            {"index": 9, "success": False, "error": "Index 9 not found"},
+        ]
+        assert read_file(writable_csv_file)["name"].tolist() == ["Jane"]
 
-    @patch('src.server.FILE_PATH')
-    @patch('src.server.read_file')
-    @patch('src.server.write_file')
-    async def test_list_columns(self, mock_write, mock_read, mock_file_path, sample_excel_file):
-        mock_file_path.return_value = sample_excel_file
-        mock_read.return_value = SAMPLE_DATA.copy()
+    async def test_delete_items_by_column_tool(self, monkeypatch, writable_csv_file):
+        monkeypatch.setattr('src.server.FILE_PATH', writable_csv_file)
+        result = await handle_call_tool("delete_items", {"indices": [25, 35], "id_column": "age"})
 
-        result = await handle_call_tool("list_columns", {})
-        print(result[0].text)
+        assert all(row["success"] for row in json.loads(result[0].text))
+        assert read_file(writable_csv_file)["name"].tolist() == ["Jane"]
 
     async def test_invalid_tool(self):
         result = await handle_call_tool("invalid_tool", {